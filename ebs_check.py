@@ -16,11 +16,49 @@ Requirements:
 """
 
 import argparse
+import hashlib
+import os
+import random
 import sys
-from typing import Dict, List, Tuple
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-import boto3
-from botocore.exceptions import ClientError
+# boto3/botocore, the optional orjson/aiobotocore packages and asyncio (used
+# only by the aiobotocore scan) are imported where first needed so `--help`
+# stays fast.
+
+# Number of concurrent DeleteVolume calls.
+DELETE_WORKERS = 16
+
+# Error codes EC2 returns when the account's API rate limit is hit.
+THROTTLE_CODES = {"RequestLimitExceeded", "Throttling"}
+
+# DeleteVolume error codes meaning the volume changed since it was listed.
+# EC2 refuses to delete in-use volumes, so these are skips, not failures.
+SKIP_CODES = {
+    "VolumeInUse": "volume became attached",
+    "InvalidVolume.NotFound": "volume no longer exists",
+}
+
+# STS identity cache, reused across runs (e.g. cron sweeps) for 24h.
+IDENTITY_CACHE_DIR = os.path.expanduser("~/.cache/ebs_check")
+IDENTITY_CACHE_TTL = 24 * 60 * 60
+
+# DescribeVolumes page size (the API maximum). Bigger pages mean fewer HTTP
+# round trips per scan, at the cost of a larger response per request.
+PAGE_SIZE = 500
+
+_AVAILABLE = "available"
+
+# EC2 client settings, shared by the boto3 and aiobotocore clients. Adaptive
+# retries rate-limit the client under API throttling; the larger connection
+# pool keeps the delete workers from queueing on urllib3.
+EC2_CLIENT_CONFIG = {
+    "retries": {"max_attempts": 10, "mode": "adaptive"},
+    "max_pool_connections": 32,
+}
 
 
 def get_identity(session) -> Tuple[str, str]:
@@ -34,14 +72,73 @@ def get_identity(session) -> Tuple[str, str]:
     return partition, account_id
 
 
+def _load_cached_identity(session) -> Tuple[str, str]:
+    """Like get_identity, but cached on disk per credential source."""
+    import json
+
+    creds = session.get_credentials()
+    if creds is None or not creds.access_key:
+        return get_identity(session)
+
+    # The access key ID isn't secret; hash all of it so different credentials
+    # under the same profile (e.g. env vars under "default") never collide.
+    source = f"{creds.access_key}:{session.profile_name}"
+    key = hashlib.sha256(source.encode()).hexdigest()
+    path = os.path.join(IDENTITY_CACHE_DIR, "identity.json")
+
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    entry = cache.get(key)
+    if entry and time.time() - entry.get("ts", 0) < IDENTITY_CACHE_TTL:
+        return entry["partition"], entry["account_id"]
+
+    partition, account_id = get_identity(session)
+    now = time.time()
+    # Drop expired entries so rotating temporary credentials don't grow the file
+    cache = {
+        k: e for k, e in cache.items()
+        if isinstance(e, dict) and now - e.get("ts", 0) < IDENTITY_CACHE_TTL
+    }
+    cache[key] = {"partition": partition, "account_id": account_id, "ts": now}
+    try:
+        os.makedirs(IDENTITY_CACHE_DIR, exist_ok=True)
+        # Write a temp file and rename it, so concurrent runs never see a
+        # truncated cache
+        fd, tmp_path = tempfile.mkstemp(dir=IDENTITY_CACHE_DIR, prefix=".identity-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass  # Caching is best-effort
+    return partition, account_id
+
+
 def volume_arn(partition: str, region: str, account_id: str, volume_id: str) -> str:
     return f"arn:{partition}:ec2:{region}:{account_id}:volume/{volume_id}"
 
 
+def _tag_name(volume: Dict) -> str:
+    """Return the volume's Name tag, or "" if it has none."""
+    return next((t["Value"] for t in (volume.get("Tags") or ()) if t["Key"] == "Name"), "")
+
+
 def format_volume_details(volume: Dict, partition: str, region: str, account_id: str) -> str:
     """Format comprehensive volume details for display."""
+    return _format_volume_details(volume, volume_arn(partition, region, account_id, ""))
+
+
+def _format_volume_details(volume: Dict, arn_prefix: str) -> str:
+    """format_volume_details with a precomputed ARN prefix (up to "volume/")."""
     vid = volume["VolumeId"]
-    arn = volume_arn(partition, region, account_id, vid)
+    arn = arn_prefix + vid
 
     # Basic info
     size = volume.get("Size", "unknown")
@@ -109,55 +206,336 @@ def format_volume_details(volume: Dict, partition: str, region: str, account_id:
     return "\n".join(f"  {line}" for line in lines)
 
 
-def describe_all_volumes(ec2) -> List[Dict]:
-    """Get all EBS volumes in the region."""
-    paginator = ec2.get_paginator("describe_volumes")
-    pages = paginator.paginate()
+def build_filters(
+    az: Optional[str] = None, vtype: Optional[str] = None, name_tag: Optional[str] = None
+) -> List[Dict]:
+    """Build DescribeVolumes filters so EC2 prunes results server-side."""
+    filters = []
+    if az:
+        filters.append({"Name": "availability-zone", "Values": [az]})
+    if vtype:
+        filters.append({"Name": "volume-type", "Values": [vtype]})
+    if name_tag:
+        filters.append({"Name": "tag:Name", "Values": [name_tag]})
+    return filters
 
-    vols = []
-    for page in pages:
-        vols.extend(page.get("Volumes", []))
-    return vols
 
+def paginate_kwargs(filters: Optional[List[Dict]] = None, unattached_only: bool = False) -> Dict:
+    """Arguments for the describe_volumes paginator's paginate() call."""
+    base = [{"Name": "status", "Values": [_AVAILABLE]}] if unattached_only else []
+    return {"Filters": base + list(filters or []), "PaginationConfig": {"PageSize": PAGE_SIZE}}
 
-def describe_unattached_volumes(ec2) -> List[Dict]:
-    """Unattached EBS volumes are those with State == 'available'."""
-    paginator = ec2.get_paginator("describe_volumes")
-    pages = paginator.paginate(Filters=[{"Name": "status", "Values": ["available"]}])
 
-    vols = []
-    for page in pages:
-        vols.extend(page.get("Volumes", []))
-    return vols
+def iter_all_volumes(paginator, filters: Optional[List[Dict]] = None) -> Iterator[Dict]:
+    """Yield all EBS volumes in the region, optionally narrowed by filters.
+
+    paginator is ec2.get_paginator("describe_volumes"); build it once per
+    client and reuse it. Volumes are yielded page by page, so only one page
+    is held in memory.
+    """
+    for page in paginator.paginate(**paginate_kwargs(filters)):
+        yield from page.get("Volumes", [])
+
 
+def iter_unattached_volumes(paginator, filters: Optional[List[Dict]] = None) -> Iterator[Dict]:
+    """Yield unattached EBS volumes, i.e. those with State == 'available'."""
+    for page in paginator.paginate(**paginate_kwargs(filters, unattached_only=True)):
+        yield from page.get("Volumes", [])
 
 
+def describe_all_volumes(paginator, filters: Optional[List[Dict]] = None) -> List[Dict]:
+    """Get all EBS volumes in the region as a list."""
+    return list(iter_all_volumes(paginator, filters))
+
+
+def describe_unattached_volumes(paginator, filters: Optional[List[Dict]] = None) -> List[Dict]:
+    """Get unattached EBS volumes as a list."""
+    return list(iter_unattached_volumes(paginator, filters))
+
 
 def is_unattached(volume: Dict) -> bool:
     # Most reliable: State == 'available'
-    if volume.get("State") == "available":
+    if volume.get("State") == _AVAILABLE:
         return True
     # Extra guard: if AWS ever returns attachments empty but state differs
     atts = volume.get("Attachments", [])
     return len(atts) == 0
 
 
-def delete_volume(ec2, volume_id: str) -> Tuple[bool, str]:
-    """Attempt deletion. Returns (ok, message)."""
+def delete_volume(ec2, volume_id: str, max_attempts: int = 2) -> Tuple[str, str]:
+    """Attempt deletion. Returns (status, message).
+
+    status is "deleted", "skipped" (the volume was attached or removed since
+    listing; EC2 rejects the delete) or "failed".
+
+    Throttling is retried by botocore's adaptive mode first (see
+    make_ec2_client). This loop only adds one jittered back-off and retry
+    after botocore gives up, so a throttled volume costs at most
+    max_attempts x 10 HTTP attempts.
+    """
+    from botocore.exceptions import ClientError
+
+    for attempt in range(max_attempts):
+        try:
+            ec2.delete_volume(VolumeId=volume_id)
+            return "deleted", "Deleted"
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code", "")
+            msg = e.response.get("Error", {}).get("Message", str(e))
+            if code in SKIP_CODES:
+                return "skipped", SKIP_CODES[code]
+            if code in THROTTLE_CODES and attempt < max_attempts - 1:
+                time.sleep(min(2 ** attempt, 20) * (0.5 + random.random()))
+                continue
+            return "failed", f"{code}: {msg}"
+    return "failed", "Deletion retries exhausted"
+
+
+def format_volume_block(volume: Dict, arn_prefix: str, label: str = "- Volume Details:") -> str:
+    """Format one listing entry: label, details and a trailing blank line."""
+    return f"{label}\n{_format_volume_details(volume, arn_prefix)}\n\n"
+
+
+def write_volume_details(header: str, vols: List[Dict], arn_prefix: str, label: str = "- Volume Details:") -> None:
+    """Write a header plus the details of every volume with a single write."""
+    sys.stdout.write(header + "\n" + "".join(format_volume_block(v, arn_prefix, label) for v in vols))
+
+
+def write_json(obj) -> None:
+    """Write obj to stdout as indented JSON, using orjson when available.
+
+    Both paths emit non-ASCII characters (e.g. in Name tags) as raw UTF-8.
+    """
+    try:
+        import orjson  # Optional: much faster JSON output for large listings
+    except ImportError:
+        import json
+
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def make_ec2_client(session, region: str):
+    """Create an EC2 client tuned for concurrent deletes."""
+    from botocore.config import Config
+
+    return session.client("ec2", region_name=region, config=Config(**EC2_CLIENT_CONFIG))
+
+
+def _error_text(e: Exception) -> str:
+    """Format a botocore error as "<code>: <message>"."""
+    err = getattr(e, "response", None) or {}
+    err = err.get("Error", {})
+    return f"{err.get('Code', type(e).__name__)}: {err.get('Message', str(e))}"
+
+
+async def _scan_region_async(
+    aio_session, region: str, filters: List[Dict]
+) -> Tuple[str, Optional[List[Dict]], Optional[str]]:
+    """Return (region, volumes, None), or (region, None, error) if the scan failed."""
+    from aiobotocore.config import AioConfig
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    config = AioConfig(**EC2_CLIENT_CONFIG)
+    try:
+        async with aio_session.create_client("ec2", region_name=region, config=config) as ec2:
+            paginator = ec2.get_paginator("describe_volumes")
+            vols = []
+            async for page in paginator.paginate(**paginate_kwargs(filters, unattached_only=True)):
+                vols.extend(page.get("Volumes", []))
+            return region, vols, None
+    except (ClientError, BotoCoreError) as e:
+        return region, None, _error_text(e)
+
+
+async def scan_all(
+    regions: List[str], filters: List[Dict]
+) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
+    """Describe unattached volumes in all regions concurrently (aiobotocore).
+
+    Returns ({region: volumes}, {region: error}) like scan_regions().
+    """
+    import asyncio
+
+    from aiobotocore.session import AioSession
+
+    aio_session = AioSession()
+    results = await asyncio.gather(
+        *(_scan_region_async(aio_session, r, filters) for r in regions)
+    )
+    vols_by_region = {r: vols for r, vols, err in results if err is None}
+    errors = {r: err for r, vols, err in results if err is not None}
+    return vols_by_region, errors
+
+
+def scan_regions(
+    regions: List[str], filters: List[Dict], client_for: Callable[[str], object]
+) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
+    """Scan regions concurrently for unattached volumes.
+
+    Returns ({region: volumes}, {region: error}); a region that fails (e.g.
+    an opt-in region that isn't enabled) appears only in the errors, so the
+    other regions' results are kept. Uses aiobotocore when installed,
+    otherwise one thread per region with the boto3 client returned by
+    client_for(region).
+    """
     try:
-        ec2.delete_volume(VolumeId=volume_id)
-        return True, "Deleted"
-    except ClientError as e:
-        code = e.response.get("Error", {}).get("Code", "")
-        msg = e.response.get("Error", {}).get("Message", str(e))
-        return False, f"{code}: {msg}"
+        import aiobotocore  # noqa: F401  Optional dependency
+    except ImportError:
+        pass
+    else:
+        import asyncio
+
+        return asyncio.run(scan_all(regions, filters))
+
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    vols_by_region, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=len(regions)) as pool:
+        futures = {
+            r: pool.submit(describe_unattached_volumes, client_for(r).get_paginator("describe_volumes"), filters)
+            for r in regions
+        }
+        for r, fut in futures.items():
+            try:
+                vols_by_region[r] = fut.result()
+            except (ClientError, BotoCoreError) as e:
+                errors[r] = _error_text(e)
+    return vols_by_region, errors
+
+
+def build_rows(vols: List[Dict], arn_prefix: str) -> List[Dict]:
+    """Build the listing rows for unattached volumes."""
+    rows = []
+    for v in vols:
+        vid = v["VolumeId"]
+        arn = arn_prefix + vid
+        size = v.get("Size")
+        vtype = v.get("VolumeType")
+        az = v.get("AvailabilityZone")
+        name = _tag_name(v)
+        rows.append(
+            {
+                "VolumeId": vid,
+                "Arn": arn,
+                "SizeGiB": size,
+                "Type": vtype,
+                "AZ": az,
+                "NameTag": name,
+            }
+        )
+    return rows
+
+
+def delete_volumes(jobs: List[Tuple[object, str, str]]) -> int:
+    """Delete volumes concurrently and print results. Returns the exit code.
+
+    Each job is (ec2_client, volume_id, label); label is used in the output.
+    """
+    print(f"\n⚠️  DELETING {len(jobs)} unattached volume(s)...")
+    ok_count = 0
+    skip_count = 0
+    fail_count = 0
+
+    # No re-describe before deleting: DeleteVolume itself rejects volumes
+    # that became attached (VolumeInUse), which we report as a skip.
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+        futures = {pool.submit(delete_volume, ec2, vid): label for ec2, vid, label in jobs}
+        for fut in as_completed(futures):
+            label = futures[fut]
+            status, msg = fut.result()
+            if status == "deleted":
+                ok_count += 1
+                print(f"✓ {label}: {msg}")
+            elif status == "skipped":
+                skip_count += 1
+                print(f"✗ SKIP {label}: {msg}")
+            else:
+                fail_count += 1
+                print(f"✗ {label}: {msg}")
+
+    print(f"\n✅ Summary: deleted={ok_count} skipped={skip_count} failed={fail_count}")
+    if fail_count == 0 and skip_count == 0:
+        print("All deletions completed successfully.")
+    return 0 if fail_count == 0 and skip_count == 0 else 1
+
+
+def main_multi_region(args, session, regions: List[str], filters: List[Dict]) -> int:
+    """List (and delete) unattached volumes across several regions at once."""
+    partition, account_id = _load_cached_identity(session)
+
+    # boto3 clients are only needed for the threaded scan and for deletion,
+    # so create them on first use (always from this thread).
+    clients = {}
+
+    def client_for(region: str):
+        if region not in clients:
+            clients[region] = make_ec2_client(session, region)
+        return clients[region]
+
+    vols_by_region, errors = scan_regions(regions, filters, client_for)
+    for r, err in errors.items():
+        print(f"ERROR [{r}]: {err}", file=sys.stderr)
+    # Carry on with the regions that could be scanned, but still exit non-zero
+    scanned = [r for r in regions if r in vols_by_region]
+    status = 1 if errors else 0
+
+    rows = []
+    for r in scanned:
+        arn_prefix = volume_arn(partition, r, account_id, "")
+        rows.extend({"Region": r, **row} for row in build_rows(vols_by_region[r], arn_prefix))
+
+    if args.output == "json":
+        write_json(rows)
+    else:
+        for r in scanned:
+            vols = vols_by_region[r]
+            if not vols:
+                continue
+            write_volume_details(
+                f"Unattached EBS volumes in {r} (account {account_id}):",
+                vols,
+                volume_arn(partition, r, account_id, ""),
+                label=f"- [{r}] Volume Details:",
+            )
+
+        print(f"Summary: Found {len(rows)} unattached volume(s) across {len(scanned)} region(s) ready for cleanup")
+
+    if args.dry_run:
+        if rows:
+            print(f"\n--dry-run mode: {len(rows)} volume(s) listed above (NOT deleted)")
+        return status
+    if not rows:
+        return status
+    return max(
+        status,
+        delete_volumes(
+            [(client_for(row["Region"]), row["VolumeId"], f"[{row['Region']}] {row['VolumeId']}") for row in rows]
+        ),
+    )
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(
-        description="List/delete unattached EBS volumes. Shows all volumes by default. Use --dry-run to only list without deleting."
+        description=(
+            "List/delete unattached EBS volumes. Shows all volumes by default "
+            "(only unattached ones when scanning several --regions). "
+            "Use --dry-run to only list without deleting."
+        )
     )
     ap.add_argument("--region", help="AWS region (defaults to your configured region).")
+    ap.add_argument(
+        "--regions",
+        help=(
+            "Comma-separated list of regions to scan concurrently (e.g. us-east-1,eu-west-1). "
+            "With more than one region, only unattached volumes are listed. Cannot be combined with --region."
+        ),
+    )
     ap.add_argument(
         "--dry-run",
         action="store_true",
@@ -169,8 +547,24 @@ def main() -> int:
         default="text",
         help="Output format for listing (default: text).",
     )
+    ap.add_argument("--az", help="Only include volumes in this availability zone.")
+    ap.add_argument("--type", dest="vtype", help="Only include volumes of this type (e.g. gp3).")
+    ap.add_argument("--name-tag", help="Only include volumes whose Name tag matches (wildcards allowed).")
 
     args = ap.parse_args()
+    if args.region and args.regions:
+        ap.error("--region and --regions cannot be used together")
+
+    import boto3
+
+    filters = build_filters(az=args.az, vtype=args.vtype, name_tag=args.name_tag)
+
+    # De-duplicate (keeping order) so a repeated region isn't listed or deleted twice
+    regions = list(dict.fromkeys(r.strip() for r in (args.regions or "").split(",") if r.strip()))
+    if len(regions) > 1:
+        return main_multi_region(args, boto3.Session(), regions, filters)
+    if regions:
+        args.region = regions[0]
 
     # Default credential chain
     session = boto3.Session(region_name=args.region)
@@ -183,60 +577,43 @@ def main() -> int:
         )
         return 2
 
-    ec2 = session.client("ec2", region_name=region)
-    partition, account_id = get_identity(session)
+    ec2 = make_ec2_client(session, region)
+    partition, account_id = _load_cached_identity(session)
+    arn_prefix = volume_arn(partition, region, account_id, "")
 
     # Get all volume information by default (verbose behavior)
-    all_volumes = describe_all_volumes(ec2)
-
-    # Analyze volume states
-    unattached_volumes = [v for v in all_volumes if is_unattached(v)]
-    attached_volumes = [v for v in all_volumes if not is_unattached(v)]
-
-    if attached_volumes:
-        print(f"Attached EBS volumes in {region} (account {account_id}):")
-        for v in attached_volumes:
-            print(f"- Volume Details:")
-            print(format_volume_details(v, partition, region, account_id))
-            print()
-
+    paginator = ec2.get_paginator("describe_volumes")
+    all_volumes = iter_all_volumes(paginator, filters)
+
+    # Analyze volume states in a single pass (bound methods hoisted out of the
+    # loop; the check is is_unattached() inlined to skip a call per volume).
+    # Attached volumes are printed as they stream in; only the unattached
+    # ones, needed for the rows and deletion, are kept.
+    unattached_volumes = []
+    add_unattached = unattached_volumes.append
+    write = sys.stdout.write
+    seen_attached = False
+    for v in all_volumes:
+        if v.get("State") == _AVAILABLE or not v.get("Attachments"):
+            add_unattached(v)
+        else:
+            if not seen_attached:
+                write(f"Attached EBS volumes in {region} (account {account_id}):\n")
+                seen_attached = True
+            write(format_volume_block(v, arn_prefix))
+
+    if seen_attached:
         print("=" * 80)
 
     vols = unattached_volumes
-
-    # Build result rows
-    rows = []
-    for v in vols:
-        vid = v["VolumeId"]
-        arn = volume_arn(partition, region, account_id, vid)
-        size = v.get("Size")
-        vtype = v.get("VolumeType")
-        az = v.get("AvailabilityZone")
-        tags = {t["Key"]: t["Value"] for t in v.get("Tags", [])} if v.get("Tags") else {}
-        name = tags.get("Name", "")
-        rows.append(
-            {
-                "VolumeId": vid,
-                "Arn": arn,
-                "SizeGiB": size,
-                "Type": vtype,
-                "AZ": az,
-                "NameTag": name,
-            }
-        )
+    rows = build_rows(vols, arn_prefix)
 
     # Output listing
     if args.output == "json":
-        import json
-
-        print(json.dumps(rows, indent=2))
+        write_json(rows)
     else:
         if rows:
-            print(f"Unattached EBS volumes in {region} (account {account_id}):")
-            for v in vols:
-                print(f"- Volume Details:")
-                print(format_volume_details(v, partition, region, account_id))
-                print()
+            write_volume_details(f"Unattached EBS volumes in {region} (account {account_id}):", vols, arn_prefix)
 
         print(f"Summary: Found {len(rows)} unattached volume(s) ready for cleanup")
 
@@ -251,38 +628,7 @@ def main() -> int:
         if not rows:
             return 0
 
-        print(f"\n⚠️  DELETING {len(rows)} unattached volume(s)...")
-        ok_count = 0
-        fail_count = 0
-
-        for r in rows:
-            vid = r["VolumeId"]
-
-            # Re-check safety right before delete
-            try:
-                resp = ec2.describe_volumes(VolumeIds=[vid])
-                vinfo = resp.get("Volumes", [])
-                if not vinfo or not is_unattached(vinfo[0]):
-                    fail_count += 1
-                    print(f"✗ SKIP {vid}: volume is no longer unattached")
-                    continue
-            except ClientError:
-                fail_count += 1
-                print(f"✗ SKIP {vid}: unable to verify volume status")
-                continue
-
-            ok, msg = delete_volume(ec2, vid)
-            if ok:
-                ok_count += 1
-                print(f"✓ {vid}: {msg}")
-            else:
-                fail_count += 1
-                print(f"✗ {vid}: {msg}")
-
-        print(f"\n✅ Summary: deleted={ok_count} failed/skipped={fail_count}")
-        if fail_count == 0:
-            print("All deletions completed successfully.")
-        return 0 if fail_count == 0 else 1
+        return delete_volumes([(ec2, r["VolumeId"], r["VolumeId"]) for r in rows])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+
+import ebs_check
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:  # boto3/botocore not installed
+    ClientError = None
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": f"{code} message"}}, "DeleteVolume")
+
+
+def make_client(code):
+    ec2 = mock.Mock()
+    ec2.delete_volume.side_effect = client_error(code)
+    return ec2
+
+
+@unittest.skipIf(ClientError is None, "botocore is not installed")
+class DeleteVolumeTest(unittest.TestCase):
+    def test_success(self):
+        ec2 = mock.Mock()
+        self.assertEqual(ebs_check.delete_volume(ec2, "vol-1"), ("deleted", "Deleted"))
+        ec2.delete_volume.assert_called_once_with(VolumeId="vol-1")
+
+    def test_volume_in_use_is_skipped(self):
+        ec2 = make_client("VolumeInUse")
+        self.assertEqual(ebs_check.delete_volume(ec2, "vol-1"), ("skipped", "volume became attached"))
+        ec2.delete_volume.assert_called_once_with(VolumeId="vol-1")
+
+    def test_not_found_is_skipped(self):
+        ec2 = make_client("InvalidVolume.NotFound")
+        self.assertEqual(ebs_check.delete_volume(ec2, "vol-1"), ("skipped", "volume no longer exists"))
+        ec2.delete_volume.assert_called_once_with(VolumeId="vol-1")
+
+    def test_throttling_retries_max_attempts_then_fails(self):
+        ec2 = make_client("RequestLimitExceeded")
+        with mock.patch.object(ebs_check.time, "sleep") as sleep:
+            status, msg = ebs_check.delete_volume(ec2, "vol-1", max_attempts=3)
+        self.assertEqual(status, "failed")
+        self.assertTrue(msg.startswith("RequestLimitExceeded:"))
+        self.assertEqual(ec2.delete_volume.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_other_errors_fail_immediately(self):
+        ec2 = make_client("UnauthorizedOperation")
+        with mock.patch.object(ebs_check.time, "sleep") as sleep:
+            status, msg = ebs_check.delete_volume(ec2, "vol-1")
+        self.assertEqual((status, msg), ("failed", "UnauthorizedOperation: UnauthorizedOperation message"))
+        ec2.delete_volume.assert_called_once_with(VolumeId="vol-1")
+        sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import ebs_check
+
+
+def make_session(access_key="AKIAEXAMPLEKEY00001", profile="default"):
+    session = mock.Mock()
+    session.profile_name = profile
+    session.get_credentials.return_value = mock.Mock(access_key=access_key)
+    sts = session.client.return_value
+    sts.get_caller_identity.return_value = {
+        "Account": "123456789012",
+        "Arn": "arn:aws-us-gov:iam::123456789012:user/cleanup",
+    }
+    return session, sts
+
+
+class LoadCachedIdentityTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        patcher = mock.patch.object(ebs_check, "IDENTITY_CACHE_DIR", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cold_cache_calls_sts_once(self):
+        session, sts = make_session()
+        self.assertEqual(ebs_check._load_cached_identity(session), ("aws-us-gov", "123456789012"))
+        sts.get_caller_identity.assert_called_once_with()
+
+    def test_warm_cache_skips_sts(self):
+        ebs_check._load_cached_identity(make_session()[0])
+        session, sts = make_session()
+        self.assertEqual(ebs_check._load_cached_identity(session), ("aws-us-gov", "123456789012"))
+        sts.get_caller_identity.assert_not_called()
+
+    def test_expired_entry_calls_sts(self):
+        ebs_check._load_cached_identity(make_session()[0])
+        session, sts = make_session()
+        with mock.patch.object(ebs_check.time, "time", return_value=ebs_check.time.time() + ebs_check.IDENTITY_CACHE_TTL + 1):
+            ebs_check._load_cached_identity(session)
+        sts.get_caller_identity.assert_called_once_with()
+
+    def test_keys_sharing_a_prefix_do_not_collide(self):
+        ebs_check._load_cached_identity(make_session(access_key="AKIAEXAMPLEKEY00001")[0])
+        session, sts = make_session(access_key="AKIAEXAMPLEKEY00002")
+        ebs_check._load_cached_identity(session)
+        sts.get_caller_identity.assert_called_once_with()
+
+    def test_expired_entries_are_pruned_on_write(self):
+        start = ebs_check.time.time()
+        for i in range(5):
+            now = start + i * (ebs_check.IDENTITY_CACHE_TTL + 1)
+            with mock.patch.object(ebs_check.time, "time", return_value=now):
+                ebs_check._load_cached_identity(make_session(access_key=f"ASIAROTATEDKEY0000{i}")[0])
+        with open(os.path.join(self.cache_dir, "identity.json")) as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+    def test_write_leaves_no_temp_files(self):
+        ebs_check._load_cached_identity(make_session()[0])
+        self.assertEqual(os.listdir(self.cache_dir), ["identity.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()